@@ -1,4 +1,5 @@
 import pathlib
+from datetime import timedelta
 from email.utils import getaddresses
 
 import sentry_sdk
@@ -303,11 +304,30 @@ TAILWIND_CLI_VERSION = "4.1.3"
 # https://whitenoise.readthedocs.io/en/latest/django.html
 #
 
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    # Raw feed snapshots, used to re-parse feeds without fetching them.
+    # Set FEED_SNAPSHOTS_BACKEND and FEED_SNAPSHOTS_OPTIONS to use object storage.
+    "feed_snapshots": {
+        "BACKEND": env(
+            "FEED_SNAPSHOTS_BACKEND",
+            default="django.core.files.storage.FileSystemStorage",
+        ),
+        "OPTIONS": env.json(
+            "FEED_SNAPSHOTS_OPTIONS",
+            default={"location": str(BASE_DIR / "snapshots")},
+        ),
+    },
+}
+
 if env.bool("USE_COLLECTSTATIC", default=True):
-    STORAGES = {
-        "staticfiles": {
-            "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
-        },
+    STORAGES["staticfiles"] = {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     }
 else:
     # for development only
@@ -532,6 +552,16 @@ GDPR_COOKIE_NAME = "accept-cookies"
 
 DEFAULT_PAGE_SIZE = 30
 
+# Feed parser hot window: the newest items of a feed are synced on every change,
+# older items only if their content has changed or on a slower cadence.
+# Set to 0 to always sync the whole feed.
+
+FEED_PARSER_HOT_WINDOW = env.int("FEED_PARSER_HOT_WINDOW", default=300)
+
+FEED_PARSER_ARCHIVE_SYNC_FREQUENCY = timedelta(
+    hours=env.int("FEED_PARSER_ARCHIVE_SYNC_FREQUENCY", default=24 * 7)
+)
+
 # Default language for Discover feed
 
 DISCOVER_FEED_LANGUAGE = env("DISCOVER_FEED_LANGUAGE", default="en")
@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-19 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("episodes", "0031_alter_audiolog_current_time_alter_audiolog_duration"),
+        ("podcasts", "0065_remove_podcast_podcasts_po_pub_dat_2e433a_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="episode",
+            name="episodes_ep_guid_b00554_idx",
+        ),
+        migrations.AddField(
+            model_name="episode",
+            name="guid_hash",
+            field=models.BigIntegerField(default=0),
+            preserve_default=False,
+        ),
+        # Must match listenwave.episodes.models.make_guid_hash()
+        migrations.RunSQL(
+            sql="""
+UPDATE episodes_episode
+SET guid_hash = ('x' || substr(md5(guid), 1, 16))::bit(64)::bigint;
+""",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="episode",
+            index=models.Index(
+                fields=["podcast", "guid_hash"], name="episodes_ep_podcast_48e6eb_idx"
+            ),
+        ),
+    ]
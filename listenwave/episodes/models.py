@@ -1,3 +1,4 @@
+import hashlib
 from typing import ClassVar, Optional
 
 from django.conf import settings
@@ -19,6 +20,17 @@ from listenwave.sanitizer import strip_html
 from listenwave.search import SearchableMixin
 
 
+def make_guid_hash(guid: str) -> int:
+    """Returns signed 64-bit hash of an episode GUID.
+
+    This matches the PostgreSQL expression
+    `('x' || substr(md5(guid), 1, 16))::bit(64)::bigint`, so the value can be
+    computed in either Python or SQL.
+    """
+    digest = hashlib.md5(guid.encode(), usedforsecurity=False).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
 class EpisodeQuerySet(SearchableMixin, FastUpdateQuerySet):
     """QuerySet for Episode model."""
 
@@ -38,6 +50,7 @@ class Episode(models.Model):
     )
 
     guid = models.TextField()
+    guid_hash = models.BigIntegerField()
 
     pub_date = models.DateTimeField()
 
@@ -86,7 +99,8 @@ class Episode(models.Model):
             models.Index(fields=["podcast", "season", "-pub_date", "-id"]),
             models.Index(fields=["pub_date", "id"]),
             models.Index(fields=["-pub_date", "-id"]),
-            models.Index(fields=["guid"]),
+            # Feed parser lookup index
+            models.Index(fields=["podcast", "guid_hash"]),
             GinIndex(fields=["search_vector"]),
         ]
 
@@ -94,6 +108,11 @@ class Episode(models.Model):
         """Returns title or guid."""
         return self.title or self.guid
 
+    def save(self, **kwargs) -> None:
+        """Overrides save to generate GUID hash."""
+        self.guid_hash = make_guid_hash(self.guid)
+        super().save(**kwargs)
+
     def get_absolute_url(self) -> str:
         """Canonical episode URL."""
         return reverse(
@@ -1,7 +1,8 @@
 import pytest
+from django.db.models.expressions import RawSQL
 from django.utils import timezone
 
-from listenwave.episodes.models import AudioLog, Bookmark, Episode
+from listenwave.episodes.models import AudioLog, Bookmark, Episode, make_guid_hash
 from listenwave.episodes.tests.factories import (
     AudioLogFactory,
     BookmarkFactory,
@@ -23,9 +24,36 @@ class TestEpisodeManager:
         assert Episode.objects.search("").count() == 0
 
 
+class TestMakeGuidHash:
+    def test_same_guid(self):
+        assert make_guid_hash("abc") == make_guid_hash("abc")
+
+    def test_different_guid(self):
+        assert make_guid_hash("abc") != make_guid_hash("abd")
+
+    def test_signed_64_bit(self):
+        assert make_guid_hash("abc") == -8070080442485551184
+
+    @pytest.mark.django_db
+    def test_matches_sql(self, episode):
+        Episode.objects.filter(pk=episode.pk).update(
+            guid_hash=RawSQL(
+                "('x' || substr(md5(guid), 1, 16))::bit(64)::bigint",
+                (),
+            )
+        )
+        episode.refresh_from_db()
+        assert episode.guid_hash == make_guid_hash(episode.guid)
+
+
 class TestEpisodeModel:
     link = "https://example.com"
 
+    @pytest.mark.django_db
+    def test_save_guid_hash(self):
+        episode = EpisodeFactory(guid="abc")
+        assert episode.guid_hash == make_guid_hash("abc")
+
     @pytest.mark.django_db
     def test_next_episode_if_none(self, episode):
         assert episode.next_episode is None
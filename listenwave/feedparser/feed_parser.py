@@ -1,16 +1,19 @@
+import collections
 import dataclasses
 import functools
 import itertools
 import operator
 from collections.abc import Iterator
+from datetime import datetime, timedelta
 
+from django.conf import settings
 from django.db import transaction
 from django.db.models import Q
 from django.db.utils import DatabaseError
 from django.utils import timezone
 
-from listenwave.episodes.models import Episode
-from listenwave.feedparser import rss_fetcher, rss_parser, scheduler
+from listenwave.episodes.models import Episode, EpisodeQuerySet
+from listenwave.feedparser import rss_fetcher, rss_parser, scheduler, snapshots
 from listenwave.feedparser.exceptions import (
     DiscontinuedError,
     DuplicateError,
@@ -25,7 +28,21 @@ from listenwave.podcasts.models import Category, Podcast
 
 def parse_feed(podcast: Podcast, client: Client) -> Podcast.ParserResult:
     """Updates a Podcast instance with its RSS or Atom feed source."""
-    return _FeedParser(podcast=podcast).parse(client)
+    return _FeedParser(
+        podcast=podcast,
+        hot_window=settings.FEED_PARSER_HOT_WINDOW,
+        archive_sync_frequency=settings.FEED_PARSER_ARCHIVE_SYNC_FREQUENCY,
+    ).parse(client)
+
+
+def reparse_feed(podcast: Podcast) -> Podcast.ParserResult:
+    """Updates a Podcast instance from its last feed snapshot, without fetching the feed.
+
+    The whole feed is synced, so any changes to parsing rules are applied to all episodes.
+
+    Raises FileNotFoundError if the snapshot does not exist.
+    """
+    return _FeedParser(podcast=podcast).reparse()
 
 
 @functools.cache
@@ -38,6 +55,8 @@ def get_categories_dict() -> dict[str, Category]:
 class _FeedParser:
     podcast: Podcast
     max_retries: int = 30
+    hot_window: int = 0
+    archive_sync_frequency: timedelta = timedelta(days=7)
 
     def parse(self, client: Client) -> Podcast.ParserResult:
         """Parse the podcast's RSS feed and update the Podcast instance."""
@@ -87,15 +106,24 @@ class _FeedParser:
             ):
                 raise DuplicateError
 
-            return self._handle_success(
+            snapshots.save_snapshot(content_hash, response.content)
+
+            result = self._handle_success(
                 feed=feed,
                 rss=rss,
                 content_hash=content_hash,
+                snapshot_hash=content_hash,
                 etag=etag,
                 modified=modified,
                 parsed=parsed,
                 updated=updated,
             )
+
+            # Only the last successful snapshot is kept
+            if self.podcast.snapshot_hash not in ("", content_hash):
+                snapshots.delete_snapshot(self.podcast.snapshot_hash)
+
+            return result
         except FeedParserError as exc:
             return self._handle_error(
                 exc,
@@ -107,8 +135,34 @@ class _FeedParser:
                 updated=updated,
             )
 
+    def reparse(self) -> Podcast.ParserResult:
+        """Parse the podcast's last feed snapshot and update the Podcast instance."""
+        content = snapshots.load_snapshot(self.podcast.snapshot_hash)
+        updated = timezone.now()
+
+        try:
+            return self._handle_success(
+                feed=rss_parser.parse_rss(content),
+                updated=updated,
+            )
+        except FeedParserError as exc:
+            return self._handle_error(exc, updated=updated)
+
     def _handle_success(self, feed: Feed, **fields) -> Podcast.ParserResult:
         result = Podcast.ParserResult.SUCCESS
+
+        archive_hash = feed.get_archive_hash(self.hot_window) if self.hot_window else ""
+
+        if self._is_archive_synced(archive_hash, fields["updated"]):
+            # Archive is unchanged, so only sync the newest items
+            cutoff = feed.get_archive_items(self.hot_window)[0].pub_date
+            items = [item for item in feed.items if item.pub_date > cutoff]
+            archive_synced = self.podcast.archive_synced
+        else:
+            cutoff = None
+            items = feed.items
+            archive_synced = fields["updated"]
+
         try:
             with transaction.atomic():
                 Podcast.objects.filter(pk=self.podcast.pk).update(
@@ -118,6 +172,8 @@ class _FeedParser:
                     num_episodes=len(feed.items),
                     extracted_text=feed.tokenize(),
                     frequency=scheduler.schedule(feed),
+                    archive_hash=archive_hash,
+                    archive_synced=archive_synced,
                     **feed.model_dump(
                         exclude={
                             "canonical_url",
@@ -129,11 +185,21 @@ class _FeedParser:
                     **fields,
                 )
                 self._parse_categories(feed)
-                self._parse_episodes(feed)
+                self._parse_episodes(items, since=cutoff)
         except DatabaseError as exc:
             raise InvalidDataError from exc
         return result
 
+    def _is_archive_synced(self, archive_hash: str, updated: datetime) -> bool:
+        """Check if the archive items are unchanged since the last full sync,
+        and the last full sync is recent."""
+        return bool(
+            archive_hash
+            and archive_hash == self.podcast.archive_hash
+            and self.podcast.archive_synced
+            and self.podcast.archive_synced > updated - self.archive_sync_frequency
+        )
+
     def _handle_error(self, exc: FeedParserError, **fields) -> Podcast.ParserResult:
         # Handle errors when parsing a feed
         active = True
@@ -197,45 +263,165 @@ class _FeedParser:
         }
         self.podcast.categories.set(categories)
 
-    def _parse_episodes(self, feed: Feed) -> None:
-        """Parse the podcast's RSS feed and update the episodes."""
-        # Delete any episodes that are not in the feed
+    def _parse_episodes(
+        self, items: list[Item], *, since: datetime | None = None
+    ) -> None:
+        """Update the episodes from the feed items.
+
+        If `since` is provided, only episodes published after this date are synced.
+        """
         qs = Episode.objects.filter(podcast=self.podcast)
-        qs.exclude(guid__in={item.guid for item in feed.items}).delete()
+
+        if since:
+            qs = qs.filter(pub_date__gt=since)
+
+        guids_by_hash: dict[int, set[str]] = collections.defaultdict(set)
+        for item in items:
+            guids_by_hash[item.guid_hash].add(item.guid)
+
+        episode_ids_by_hash: dict[int, list[int]] = collections.defaultdict(list)
+        for guid_hash, episode_id in qs.values_list("guid_hash", "pk"):
+            episode_ids_by_hash[guid_hash].append(episode_id)
+
+        # Find any episodes that are not in the feed
+        if vanished := {
+            episode_id
+            for guid_hash, episode_ids in episode_ids_by_hash.items()
+            if guid_hash not in guids_by_hash
+            for episode_id in episode_ids
+        }:
+            # Episodes with changed GUIDs are updated in place rather than
+            # deleted and re-inserted.
+            for episode_id, item in self._reconcile_guids(
+                qs.filter(pk__in=vanished),
+                [item for item in items if item.guid_hash not in episode_ids_by_hash],
+            ):
+                vanished.remove(episode_id)
+                episode_ids_by_hash[item.guid_hash].append(episode_id)
+
+            # Delete any remaining episodes that are not in the feed
+            qs.filter(pk__in=vanished).delete()
 
         # Create a dictionary of guids to episode pks
-        guids = dict(qs.values_list("guid", "pk"))
+        guids = self._get_episode_ids(qs, guids_by_hash, episode_ids_by_hash)
         fields_to_update = _item_fields("guid", "categories")
 
         for batch in itertools.batched(
-            self._episodes_for_update(feed, guids),
+            self._episodes_for_update(items, guids),
             1000,
             strict=False,
         ):
             Episode.objects.fast_update(batch, fields=fields_to_update)
 
         for batch in itertools.batched(
-            self._episodes_for_insert(feed, guids),
+            self._episodes_for_insert(items, guids),
             100,
             strict=False,
         ):
             Episode.objects.bulk_create(batch, ignore_conflicts=True)
 
+    def _reconcile_guids(
+        self, qs: EpisodeQuerySet, items: list[Item]
+    ) -> list[tuple[int, Item]]:
+        """Match episodes no longer in the feed with new items.
+
+        Some hosts rewrite all GUIDs e.g. when migrating platforms. To avoid
+        deleting and re-inserting the whole feed, episodes are matched on media URL,
+        then title and pub date, and their GUIDs updated.
+
+        Returns list of matching episode IDs and items.
+        """
+        if not items:
+            return []
+
+        by_media_url: dict[str, int] = {}
+        by_title: dict[tuple[str, datetime], int] = {}
+
+        for episode_id, media_url, title, pub_date in qs.values_list(
+            "pk", "media_url", "title", "pub_date"
+        ):
+            by_media_url.setdefault(media_url, episode_id)
+            by_title.setdefault((title, pub_date), episode_id)
+
+        matches: dict[int, Item] = {}
+        guids: set[str] = set()
+
+        for item in items:
+            if item.guid in guids:
+                continue
+            for episode_id in (
+                by_media_url.get(item.media_url),
+                by_title.get((item.title, item.pub_date)),
+            ):
+                if episode_id and episode_id not in matches:
+                    matches[episode_id] = item
+                    guids.add(item.guid)
+                    break
+
+        for batch in itertools.batched(matches.items(), 1000, strict=False):
+            Episode.objects.fast_update(
+                [
+                    Episode(
+                        pk=episode_id,
+                        guid=item.guid,
+                        guid_hash=item.guid_hash,
+                    )
+                    for episode_id, item in batch
+                ],
+                fields=["guid", "guid_hash"],
+            )
+
+        return list(matches.items())
+
+    def _get_episode_ids(
+        self,
+        qs: EpisodeQuerySet,
+        guids_by_hash: dict[int, set[str]],
+        episode_ids_by_hash: dict[int, list[int]],
+    ) -> dict[str, int]:
+        """Return dictionary of guids to episode pks.
+
+        Episodes are matched on GUID hash, so we don't need to fetch the
+        GUIDs themselves. Full GUIDs are only compared on a hash collision,
+        i.e. where more than one GUID or episode shares the same hash.
+        """
+        guids: dict[str, int] = {}
+        collisions: set[int] = set()
+
+        for guid_hash, item_guids in guids_by_hash.items():
+            match episode_ids_by_hash.get(guid_hash, []):
+                case []:
+                    pass
+                case [episode_id] if len(item_guids) == 1:
+                    guids[next(iter(item_guids))] = episode_id
+                case _:
+                    collisions.add(guid_hash)
+
+        if collisions:
+            colliding = qs.filter(guid_hash__in=collisions)
+            # Delete any colliding episodes that are not in the feed
+            colliding.exclude(
+                guid__in=set().union(*(guids_by_hash[h] for h in collisions))
+            ).delete()
+            guids.update(colliding.values_list("guid", "pk"))
+
+        return guids
+
     def _episodes_for_insert(
-        self, feed: Feed, guids: dict[str, int]
+        self, items: list[Item], guids: dict[str, int]
     ) -> Iterator[Episode]:
         """Return episodes that are not in the database."""
-        for item in feed.items:
+        for item in items:
             if item.guid not in guids:
                 yield self._parse_episode(item)
 
     def _episodes_for_update(
-        self, feed: Feed, guids: dict[str, int]
+        self, items: list[Item], guids: dict[str, int]
     ) -> Iterator[Episode]:
         """Return episodes that are already in the database."""
         # fast_update() requires that we have no episodes with the same PK
         episode_ids = set()
-        for item in feed.items:
+        for item in items:
             if (episode_id := guids.get(item.guid)) and episode_id not in episode_ids:
                 yield self._parse_episode(item, pk=episode_id)
                 episode_ids.add(episode_id)
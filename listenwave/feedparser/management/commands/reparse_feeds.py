@@ -0,0 +1,50 @@
+from typing import Annotated
+
+import typer
+from django_typer.management import Typer
+
+from listenwave.feedparser.feed_parser import reparse_feed
+from listenwave.podcasts.models import Podcast
+from listenwave.process_pool import execute_process_pool
+
+app = Typer(help="Re-parse podcast feeds from their last snapshots")
+
+
+@app.command()
+def handle(
+    processes: Annotated[
+        int | None,
+        typer.Option(
+            "--processes",
+            "-p",
+            help="Number of worker processes (default: number of CPUs)",
+        ),
+    ] = None,
+) -> None:
+    """Re-parse podcast feeds from their last snapshots, without fetching them.
+
+    Use to apply changes in feed parsing rules to existing podcasts.
+    """
+    podcast_ids = list(
+        Podcast.objects.exclude(snapshot_hash="")
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    execute_process_pool(_reparse_feed, podcast_ids, max_workers=processes)
+
+
+def _reparse_feed(podcast_id: int) -> Podcast.ParserResult | None:
+    podcast = Podcast.objects.get(pk=podcast_id)
+    try:
+        result = reparse_feed(podcast)
+    except FileNotFoundError:
+        typer.secho(f"{podcast}: Snapshot not found", fg=typer.colors.RED)
+        return None
+
+    color = (
+        typer.colors.GREEN
+        if result is Podcast.ParserResult.SUCCESS
+        else typer.colors.RED
+    )
+    typer.secho(f"{podcast}: {result.label}", fg=color)
+    return result
@@ -1,5 +1,6 @@
 import contextlib
 import functools
+import hashlib
 from collections.abc import Iterable
 from datetime import datetime
 from typing import Annotated, Any, ClassVar, Final, Literal, TypeVar
@@ -13,12 +14,13 @@ from pydantic import (
     BaseModel,
     BeforeValidator,
     Field,
+    computed_field,
     field_validator,
     model_validator,
 )
 
 from listenwave import tokenizer
-from listenwave.episodes.models import Episode
+from listenwave.episodes.models import Episode, make_guid_hash
 from listenwave.feedparser.date_parser import parse_date
 from listenwave.podcasts.models import Podcast
 from listenwave.validators import url_validator
@@ -179,6 +181,12 @@ class Item(BaseModel):
 
     episode_type: EpisodeType = Episode.EpisodeType.FULL
 
+    @computed_field
+    @functools.cached_property
+    def guid_hash(self) -> int:
+        """Returns 64-bit hash of the GUID."""
+        return make_guid_hash(self.guid)
+
     @field_validator("pub_date", mode="before")
     @classmethod
     def validate_pub_date(cls, value: Any) -> datetime:
@@ -313,6 +321,32 @@ class Feed(BaseModel):
         """Return sorted list of pub dates for all items in feed."""
         return [item.pub_date for item in self.items]
 
+    @functools.cached_property
+    def latest_items(self) -> list[Item]:
+        """Return items sorted by pub date, newest first."""
+        return sorted(self.items, key=lambda item: item.pub_date, reverse=True)
+
+    def get_archive_items(self, window: int) -> list[Item]:
+        """Return the archive items, i.e. the items outside the newest
+        `window` items, newest first."""
+        return self.latest_items[window:]
+
+    def get_archive_hash(self, window: int) -> str:
+        """Return hash of the archive items, i.e. the items outside the
+        newest `window` items.
+
+        The hash is based on the validated item data rather than the raw
+        XML, so only semantic changes to the archive will change the hash.
+
+        Returns an empty string if there are no archive items.
+        """
+        if archive := self.get_archive_items(window):
+            content_hash = hashlib.sha256()
+            for item in archive:
+                content_hash.update(item.model_dump_json().encode())
+            return content_hash.hexdigest()
+        return ""
+
     def tokenize(self) -> str:
         """Tokenize feed for search."""
         text = " ".join(
@@ -0,0 +1,43 @@
+import gzip
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage, storages
+
+
+def get_storage() -> Storage:
+    """Returns the storage backend for feed snapshots.
+
+    This is configured in the STORAGES setting, so object storage can be used
+    in place of the local filesystem.
+    """
+    return storages["feed_snapshots"]
+
+
+def get_snapshot_path(content_hash: str) -> str:
+    """Returns the storage path of a snapshot."""
+    return f"{content_hash[:2]}/{content_hash}.xml.gz"
+
+
+def save_snapshot(content_hash: str, content: bytes) -> None:
+    """Saves compressed raw feed content.
+
+    Snapshots are addressed by content hash, so existing snapshots are not overwritten.
+    """
+    storage = get_storage()
+    path = get_snapshot_path(content_hash)
+    if not storage.exists(path):
+        storage.save(path, ContentFile(gzip.compress(content)))
+
+
+def load_snapshot(content_hash: str) -> bytes:
+    """Returns the raw feed content of a snapshot.
+
+    Raises FileNotFoundError if the snapshot does not exist.
+    """
+    with get_storage().open(get_snapshot_path(content_hash), "rb") as fp:
+        return gzip.decompress(fp.read())
+
+
+def delete_snapshot(content_hash: str) -> None:
+    """Deletes a snapshot, if it exists."""
+    get_storage().delete(get_snapshot_path(content_hash))
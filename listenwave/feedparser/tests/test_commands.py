@@ -24,3 +24,51 @@ class TestParseFeeds:
         PodcastFactory(active=False)
         call_command("parse_feeds")
         mock_parse.assert_not_called()
+
+
+class TestReparseFeeds:
+    _REPARSE_FEED = (
+        "listenwave.feedparser.management.commands.reparse_feeds.reparse_feed"
+    )
+
+    @pytest.fixture
+    def mock_process_pool(self, mocker):
+        # run in the test process, as child processes cannot see the test database
+        return mocker.patch(
+            "listenwave.feedparser.management.commands.reparse_feeds.execute_process_pool",
+            side_effect=lambda fn, items, **kwargs: [fn(item) for item in items],
+        )
+
+    @pytest.mark.django_db
+    def test_ok(self, mocker, mock_process_pool):
+        mock_reparse = mocker.patch(
+            self._REPARSE_FEED,
+            return_value=Podcast.ParserResult.SUCCESS,
+        )
+        podcast = PodcastFactory(snapshot_hash="abc123")
+        PodcastFactory(snapshot_hash="")
+
+        call_command("reparse_feeds", "--processes", "2")
+
+        mock_reparse.assert_called_once_with(podcast)
+        assert mock_process_pool.call_args.kwargs == {"max_workers": 2}
+
+    @pytest.mark.django_db
+    def test_error(self, mocker, mock_process_pool):
+        mock_reparse = mocker.patch(
+            self._REPARSE_FEED,
+            return_value=Podcast.ParserResult.INVALID_RSS,
+        )
+        PodcastFactory(snapshot_hash="abc123")
+        call_command("reparse_feeds")
+        mock_reparse.assert_called_once()
+
+    @pytest.mark.django_db
+    def test_snapshot_not_found(self, mocker, mock_process_pool):
+        mock_reparse = mocker.patch(
+            self._REPARSE_FEED,
+            side_effect=FileNotFoundError,
+        )
+        PodcastFactory(snapshot_hash="abc123")
+        call_command("reparse_feeds")
+        mock_reparse.assert_called_once()
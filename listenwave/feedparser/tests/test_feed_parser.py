@@ -1,16 +1,24 @@
 import http
 import pathlib
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import httpx
 import pytest
+from django.utils import timezone
 from django.utils.text import slugify
 
-from listenwave.episodes.models import Episode
-from listenwave.episodes.tests.factories import EpisodeFactory
+from listenwave.episodes.models import Bookmark, Episode, make_guid_hash
+from listenwave.episodes.tests.factories import BookmarkFactory, EpisodeFactory
 from listenwave.feedparser.date_parser import parse_date
-from listenwave.feedparser.feed_parser import get_categories_dict, parse_feed
+from listenwave.feedparser import snapshots
+from listenwave.feedparser.feed_parser import (
+    get_categories_dict,
+    parse_feed,
+    reparse_feed,
+)
+from listenwave.feedparser.models import Feed
 from listenwave.feedparser.rss_fetcher import make_content_hash
+from listenwave.feedparser.tests.factories import FeedFactory, ItemFactory
 from listenwave.http_client import Client
 from listenwave.podcasts.models import Category, Podcast
 from listenwave.podcasts.tests.factories import PodcastFactory
@@ -110,8 +118,11 @@ class TestFeedParser:
         assert podcast.active is True
         assert podcast.num_retries == 0
         assert podcast.content_hash
+        assert podcast.snapshot_hash == podcast.content_hash
         assert podcast.title == "Mysterious Universe"
 
+        assert snapshots.load_snapshot(podcast.snapshot_hash) == self.get_rss_content()
+
         assert podcast.description == "Blog and Podcast specializing in offbeat news"
         assert podcast.owner == "8th Kind"
 
@@ -243,6 +254,43 @@ class TestFeedParser:
         assert podcast.active is False
         assert podcast.canonical == other
 
+    @pytest.mark.django_db
+    def test_parse_guid_hash_collision(self, categories):
+        podcast = PodcastFactory(
+            rss="https://mysteriousuniverse.org/feed/podcast/",
+        )
+
+        episode_guid = "https://mysteriousuniverse.org/?p=168097"
+
+        episode = EpisodeFactory(
+            podcast=podcast,
+            guid=episode_guid,
+            title="original title",
+        )
+
+        # stale episode with hash colliding with an episode in the feed
+        colliding = EpisodeFactory(podcast=podcast)
+        Episode.objects.filter(pk=colliding.pk).update(guid_hash=episode.guid_hash)
+
+        client = _mock_client(
+            url=podcast.rss,
+            status_code=http.HTTPStatus.OK,
+            content=self.get_rss_content(),
+            headers={
+                "ETag": "abc123",
+                "Last-Modified": self.updated,
+            },
+        )
+
+        assert parse_feed(podcast, client) is Podcast.ParserResult.SUCCESS
+
+        assert not podcast.episodes.filter(pk=colliding.pk).exists()
+
+        episode.refresh_from_db()
+        assert episode.title != "original title"
+
+        assert podcast.episodes.count() == 20
+
     @pytest.mark.django_db
     def test_parse_serial(self):
         podcast = PodcastFactory(
@@ -555,6 +603,25 @@ class TestFeedParser:
 
         assert podcast.canonical == other
 
+    @pytest.mark.django_db
+    def test_parse_previous_snapshot_deleted(self, categories):
+        snapshots.save_snapshot("previous", b"<rss />")
+        podcast = PodcastFactory(snapshot_hash="previous")
+
+        client = _mock_client(
+            status_code=http.HTTPStatus.OK,
+            content=self.get_rss_content(),
+        )
+
+        assert parse_feed(podcast, client) is Podcast.ParserResult.SUCCESS
+
+        podcast.refresh_from_db()
+
+        assert podcast.snapshot_hash == make_content_hash(self.get_rss_content())
+
+        with pytest.raises(FileNotFoundError):
+            snapshots.load_snapshot("previous")
+
     @pytest.mark.django_db
     def test_parse_invalid_data(self, podcast):
         client = _mock_client(
@@ -571,6 +638,7 @@ class TestFeedParser:
         assert podcast.active
         assert podcast.parsed
         assert podcast.num_retries == 1
+        assert podcast.snapshot_hash == ""
 
     @pytest.mark.django_db
     def test_parse_no_podcasts(self, podcast):
@@ -694,3 +762,262 @@ class TestFeedParser:
         assert podcast.parsed
 
         assert podcast.num_retries == 32
+
+
+class TestParseEpisodesGuidChanged:
+    media_url = "https://example.com/episode-1.mp3"
+
+    @pytest.fixture
+    def client(self):
+        return _mock_client(
+            status_code=http.HTTPStatus.OK,
+            content=b"<rss />",
+        )
+
+    def _parse_feed(self, mocker, podcast, client, *items):
+        mocker.patch(
+            "listenwave.feedparser.rss_parser.parse_rss",
+            return_value=Feed(**FeedFactory(items=list(items))),
+        )
+        assert parse_feed(podcast, client) is Podcast.ParserResult.SUCCESS
+
+    @pytest.mark.django_db
+    def test_match_media_url(self, mocker, client, podcast):
+        episode = EpisodeFactory(podcast=podcast, media_url=self.media_url)
+        bookmark = BookmarkFactory(episode=episode)
+
+        self._parse_feed(
+            mocker,
+            podcast,
+            client,
+            ItemFactory(guid="new-guid", media_url=self.media_url),
+        )
+
+        episode.refresh_from_db()
+
+        assert episode.guid == "new-guid"
+        assert episode.guid_hash == make_guid_hash("new-guid")
+        assert podcast.episodes.count() == 1
+        assert Bookmark.objects.filter(pk=bookmark.pk).exists()
+
+    @pytest.mark.django_db
+    def test_match_title_and_pub_date(self, mocker, client, podcast):
+        episode = EpisodeFactory(podcast=podcast, title="Episode 1")
+
+        self._parse_feed(
+            mocker,
+            podcast,
+            client,
+            ItemFactory(
+                guid="new-guid",
+                title="Episode 1",
+                pub_date=episode.pub_date.isoformat(),
+            ),
+        )
+
+        episode.refresh_from_db()
+
+        assert episode.guid == "new-guid"
+        assert podcast.episodes.count() == 1
+
+    @pytest.mark.django_db
+    def test_match_duplicate_items(self, mocker, client, podcast):
+        episode = EpisodeFactory(podcast=podcast, media_url=self.media_url)
+
+        self._parse_feed(
+            mocker,
+            podcast,
+            client,
+            ItemFactory(guid="new-guid", media_url=self.media_url),
+            ItemFactory(guid="new-guid", media_url=self.media_url),
+            ItemFactory(guid="other-guid", media_url=self.media_url),
+        )
+
+        episode.refresh_from_db()
+
+        assert episode.guid == "new-guid"
+        assert set(podcast.episodes.values_list("guid", flat=True)) == {
+            "new-guid",
+            "other-guid",
+        }
+
+    @pytest.mark.django_db
+    def test_no_match(self, mocker, client, podcast):
+        episode = EpisodeFactory(podcast=podcast)
+
+        self._parse_feed(mocker, podcast, client, ItemFactory(guid="new-guid"))
+
+        assert not podcast.episodes.filter(pk=episode.pk).exists()
+        assert podcast.episodes.get().guid == "new-guid"
+
+    @pytest.mark.django_db
+    def test_no_new_items(self, mocker, client, podcast):
+        episode = EpisodeFactory(podcast=podcast)
+        removed = EpisodeFactory(podcast=podcast)
+
+        self._parse_feed(mocker, podcast, client, ItemFactory(guid=episode.guid))
+
+        assert podcast.episodes.filter(pk=episode.pk).exists()
+        assert not podcast.episodes.filter(pk=removed.pk).exists()
+
+
+class TestParseEpisodesHotWindow:
+    @pytest.fixture
+    def client(self):
+        return _mock_client(
+            status_code=http.HTTPStatus.OK,
+            content=b"<rss />",
+        )
+
+    @pytest.fixture
+    def feed(self):
+        now = timezone.now()
+        return Feed(
+            **FeedFactory(
+                items=[
+                    ItemFactory(
+                        guid=f"guid-{days}",
+                        pub_date=(now - timedelta(days=days)).isoformat(),
+                    )
+                    for days in range(4)
+                ]
+            )
+        )
+
+    @pytest.fixture(autouse=True)
+    def _hot_window(self, settings):
+        settings.FEED_PARSER_HOT_WINDOW = 2
+
+    def _parse_feed(self, mocker, podcast, client, feed):
+        mocker.patch(
+            "listenwave.feedparser.rss_parser.parse_rss",
+            return_value=feed,
+        )
+        assert parse_feed(podcast, client) is Podcast.ParserResult.SUCCESS
+        podcast.refresh_from_db()
+
+    @pytest.mark.django_db
+    def test_full_sync(self, mocker, client, podcast, feed):
+        self._parse_feed(mocker, podcast, client, feed)
+
+        assert podcast.episodes.count() == 4
+        assert podcast.archive_hash == feed.get_archive_hash(2)
+        assert podcast.archive_synced == podcast.parsed
+
+    @pytest.mark.django_db
+    def test_full_sync_disabled(self, mocker, client, podcast, feed, settings):
+        settings.FEED_PARSER_HOT_WINDOW = 0
+
+        self._parse_feed(mocker, podcast, client, feed)
+
+        assert podcast.episodes.count() == 4
+        assert podcast.archive_hash == ""
+        assert podcast.archive_synced == podcast.parsed
+
+    @pytest.mark.django_db
+    def test_hot_window_sync(self, mocker, client, podcast, feed):
+        archive_synced = timezone.now() - timedelta(days=1)
+
+        podcast.archive_hash = feed.get_archive_hash(2)
+        podcast.archive_synced = archive_synced
+        podcast.save()
+
+        # archive episode not in feed should not be removed
+        archived = EpisodeFactory(
+            podcast=podcast,
+            pub_date=timezone.now() - timedelta(days=30),
+        )
+        # hot episode not in feed should be removed
+        removed = EpisodeFactory(podcast=podcast)
+
+        self._parse_feed(mocker, podcast, client, feed)
+
+        assert podcast.episodes.filter(pk=archived.pk).exists()
+        assert not podcast.episodes.filter(pk=removed.pk).exists()
+
+        assert set(podcast.episodes.values_list("guid", flat=True)) == {
+            archived.guid,
+            "guid-0",
+            "guid-1",
+        }
+
+        assert podcast.num_episodes == 4
+        assert podcast.archive_synced == archive_synced
+
+    @pytest.mark.django_db
+    def test_archive_sync_expired(self, mocker, client, podcast, feed):
+        podcast.archive_hash = feed.get_archive_hash(2)
+        podcast.archive_synced = timezone.now() - timedelta(days=30)
+        podcast.save()
+
+        archived = EpisodeFactory(
+            podcast=podcast,
+            pub_date=timezone.now() - timedelta(days=30),
+        )
+
+        self._parse_feed(mocker, podcast, client, feed)
+
+        assert not podcast.episodes.filter(pk=archived.pk).exists()
+        assert podcast.episodes.count() == 4
+        assert podcast.archive_synced == podcast.parsed
+
+    @pytest.mark.django_db
+    def test_archive_changed(self, mocker, client, podcast, feed):
+        podcast.archive_hash = "changed"
+        podcast.archive_synced = timezone.now() - timedelta(days=1)
+        podcast.save()
+
+        self._parse_feed(mocker, podcast, client, feed)
+
+        assert podcast.episodes.count() == 4
+        assert podcast.archive_hash == feed.get_archive_hash(2)
+        assert podcast.archive_synced == podcast.parsed
+
+
+class TestReparseFeed:
+    @pytest.fixture
+    def podcast(self):
+        content = _get_mock_file_path("rss_mock.xml").read_bytes()
+        content_hash = make_content_hash(content)
+        snapshots.save_snapshot(content_hash, content)
+        return PodcastFactory(
+            content_hash=content_hash,
+            snapshot_hash=content_hash,
+            num_retries=3,
+        )
+
+    @pytest.mark.django_db
+    def test_ok(self, podcast, categories):
+        # episode not in feed should be removed
+        removed = EpisodeFactory(podcast=podcast)
+
+        assert reparse_feed(podcast) is Podcast.ParserResult.SUCCESS
+
+        podcast.refresh_from_db()
+
+        assert not podcast.episodes.filter(pk=removed.pk).exists()
+        assert podcast.episodes.count() == 20
+
+        assert podcast.title == "Mysterious Universe"
+        assert podcast.parser_result == Podcast.ParserResult.SUCCESS
+        assert podcast.num_retries == 0
+        assert podcast.parsed is None
+
+    @pytest.mark.django_db
+    def test_invalid_rss(self, podcast):
+        snapshots.save_snapshot("invalid", b"<rss />")
+        podcast.snapshot_hash = "invalid"
+
+        assert reparse_feed(podcast) is Podcast.ParserResult.INVALID_RSS
+
+        podcast.refresh_from_db()
+
+        assert podcast.parser_result == Podcast.ParserResult.INVALID_RSS
+        assert podcast.num_retries == 4
+
+    @pytest.mark.django_db
+    def test_snapshot_not_found(self, podcast):
+        podcast.snapshot_hash = "not-found"
+
+        with pytest.raises(FileNotFoundError):
+            reparse_feed(podcast)
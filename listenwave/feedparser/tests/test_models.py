@@ -2,7 +2,7 @@ import pytest
 from django.utils import timezone
 from pydantic import ValidationError
 
-from listenwave.episodes.models import Episode
+from listenwave.episodes.models import Episode, make_guid_hash
 from listenwave.feedparser.models import Feed, Item
 from listenwave.feedparser.tests.factories import FeedFactory, ItemFactory
 
@@ -48,6 +48,11 @@ class TestItem:
         item = Item(**ItemFactory(episode_type=Episode.EpisodeType.BONUS))
         assert item.episode_type == "bonus"
 
+    def test_guid_hash(self):
+        item = Item(**ItemFactory(guid="abc"))
+        assert item.guid_hash == make_guid_hash("abc")
+        assert item.model_dump()["guid_hash"] == item.guid_hash
+
     def test_defaults(self):
         item = Item(**ItemFactory())
         assert item.explicit is False
@@ -74,6 +79,53 @@ class TestFeed:
     def item(self):
         return Item(**ItemFactory())
 
+    @pytest.fixture
+    def items(self):
+        now = timezone.now()
+        return [
+            ItemFactory(
+                guid=f"guid-{days}",
+                pub_date=(now - timezone.timedelta(days=days)).isoformat(),
+            )
+            for days in (2, 0, 3, 1)
+        ]
+
+    def test_latest_items(self, items):
+        feed = Feed(**FeedFactory(items=items))
+        assert [item.guid for item in feed.latest_items] == [
+            "guid-0",
+            "guid-1",
+            "guid-2",
+            "guid-3",
+        ]
+
+    def test_get_archive_items(self, items):
+        feed = Feed(**FeedFactory(items=items))
+        assert [item.guid for item in feed.get_archive_items(2)] == [
+            "guid-2",
+            "guid-3",
+        ]
+
+    def test_get_archive_hash(self, items):
+        feed = Feed(**FeedFactory(items=items))
+        assert feed.get_archive_hash(2)
+
+    def test_get_archive_hash_no_archive(self, items):
+        feed = Feed(**FeedFactory(items=items))
+        assert feed.get_archive_hash(4) == ""
+
+    def test_get_archive_hash_hot_item_changed(self, items):
+        feed = Feed(**FeedFactory(items=items))
+        items[1]["title"] = "changed"
+        changed = Feed(**FeedFactory(items=items))
+        assert feed.get_archive_hash(2) == changed.get_archive_hash(2)
+
+    def test_get_archive_hash_archive_item_changed(self, items):
+        feed = Feed(**FeedFactory(items=items))
+        items[0]["title"] = "changed"
+        changed = Feed(**FeedFactory(items=items))
+        assert feed.get_archive_hash(2) != changed.get_archive_hash(2)
+
     def test_language(self, item):
         feed = Feed(**FeedFactory(language="fr-CA", items=[item]))
         assert feed.language == "fr"
@@ -0,0 +1,39 @@
+import pytest
+
+from listenwave.feedparser import snapshots
+
+
+class TestSnapshots:
+    content_hash = "abc123"
+
+    def test_get_snapshot_path(self):
+        assert snapshots.get_snapshot_path(self.content_hash) == "ab/abc123.xml.gz"
+
+    def test_save_and_load(self):
+        snapshots.save_snapshot(self.content_hash, b"<rss />")
+        assert snapshots.load_snapshot(self.content_hash) == b"<rss />"
+
+    def test_save_compressed(self):
+        snapshots.save_snapshot(self.content_hash, b"<rss />" * 1000)
+        assert snapshots.get_storage().size(
+            snapshots.get_snapshot_path(self.content_hash)
+        ) < len(b"<rss />" * 1000)
+
+    def test_save_exists(self):
+        snapshots.save_snapshot(self.content_hash, b"<rss />")
+        snapshots.save_snapshot(self.content_hash, b"<rss />")
+
+        storage = snapshots.get_storage()
+
+        assert storage.listdir("ab") == ([], ["abc123.xml.gz"])
+
+    def test_load_not_found(self):
+        with pytest.raises(FileNotFoundError):
+            snapshots.load_snapshot(self.content_hash)
+
+    def test_delete(self):
+        snapshots.save_snapshot(self.content_hash, b"<rss />")
+        snapshots.delete_snapshot(self.content_hash)
+
+        with pytest.raises(FileNotFoundError):
+            snapshots.load_snapshot(self.content_hash)
@@ -254,6 +254,9 @@ class PodcastAdmin(admin.ModelAdmin):
         "modified",
         "etag",
         "content_hash",
+        "snapshot_hash",
+        "archive_hash",
+        "archive_synced",
     )
 
     @admin.display(description="Estimated Next Update")
@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-19 08:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("podcasts", "0065_remove_podcast_podcasts_po_pub_dat_2e433a_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="podcast",
+            name="archive_hash",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="podcast",
+            name="archive_synced",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
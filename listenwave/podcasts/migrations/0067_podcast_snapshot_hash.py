@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-19 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("podcasts", "0066_podcast_archive_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="podcast",
+            name="snapshot_hash",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -230,6 +230,12 @@ class Podcast(models.Model):
 
     content_hash = models.CharField(max_length=64, blank=True)
 
+    # Content hash of the last successfully parsed feed snapshot
+    snapshot_hash = models.CharField(max_length=64, blank=True)
+
+    archive_hash = models.CharField(max_length=64, blank=True)
+    archive_synced = models.DateTimeField(null=True, blank=True)
+
     num_retries = models.PositiveSmallIntegerField(default=0)
 
     cover_url = URLField(blank=True)
@@ -0,0 +1,29 @@
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TypeVar
+
+import django
+from django.db import connections
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def execute_process_pool(
+    fn: Callable[[T], R],
+    iterable: Iterable[T],
+    **kwargs,
+) -> list[R]:
+    """Execute a function in a process pool and return the list of results.
+
+    Use for CPU-bound work. The function and its arguments must be picklable.
+    Database connections cannot be shared with child processes, so they are
+    closed first, and each child process opens its own connections.
+    """
+    connections.close_all()
+
+    with ProcessPoolExecutor(initializer=django.setup, **kwargs) as executor:
+        return [
+            future.result()
+            for future in as_completed(executor.submit(fn, item) for item in iterable)
+        ]
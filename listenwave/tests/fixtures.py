@@ -22,6 +22,9 @@ def _settings_overrides(settings: Settings) -> None:
     }
     settings.LOGGING = None
     settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    settings.STORAGES = settings.STORAGES | {
+        "feed_snapshots": {"BACKEND": "django.core.files.storage.InMemoryStorage"}
+    }
 
 
 @pytest.fixture
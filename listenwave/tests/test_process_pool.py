@@ -0,0 +1,15 @@
+import operator
+
+import pytest
+
+from listenwave.process_pool import execute_process_pool
+
+
+class TestExecuteProcessPool:
+    def test_ok(self):
+        outputs = execute_process_pool(operator.neg, [1, 2, 3], max_workers=2)
+        assert set(outputs) == {-1, -2, -3}
+
+    def test_error(self):
+        with pytest.raises(TypeError):
+            execute_process_pool(operator.neg, [1, "a"], max_workers=2)